@@ -1,4 +1,5 @@
 import os
+import sys
 import time
 import requests
 from PIL import Image, ImageDraw
@@ -10,7 +11,7 @@ from customtkinter import CTkImage
 from utils.providers import provider_lrclib
 from utils.spotify import get_current_playing_track, sp
 from utils.stats import MusicStats, StatsWindow
-from utils.font_manager import FontManager
+from utils.font_manager import font_manager
 from utils.i18n import Translator
 
 def load_environment():
@@ -36,7 +37,7 @@ class LyricsDisplayApp:
         self.root.resizable(True, True)
         self.root.configure(fg_color="#0F0F0F")
 
-        self.fonts = FontManager()
+        self.fonts = font_manager
         self.stats = MusicStats()
         self.last_track_id = None
         self.lyrics_data = None
@@ -107,7 +108,12 @@ class LyricsDisplayApp:
         self.update_loop()
 
     def update_loop(self):
-        info = get_current_playing_track()
+        try:
+            info = get_current_playing_track()
+        except Exception:
+            # Spotify didn't answer: keep the current track instead of ending it and counting it again later
+            self.root.after(500, self.update_loop)
+            return
         now = time.time()
 
         if info:
@@ -170,7 +176,7 @@ class LyricsDisplayApp:
         self.title_label.configure(text=info["title"])
         self.artist_label.configure(text=info["artist"])
         try:
-            response = requests.get(info["album_image_url"])
+            response = requests.get(info["album_image_url"], timeout=10)
             img = Image.open(BytesIO(response.content)).resize((200, 200))
             mask = Image.new("L", img.size, 0)
             draw = ImageDraw.Draw(mask)
@@ -217,5 +223,6 @@ class LyricsDisplayApp:
 
 
 if __name__ == "__main__":
+    font_manager.register_fonts()
     app = LyricsDisplayApp(ctk.CTk())
     app.root.mainloop()
@@ -1,21 +1,101 @@
+import os
+import sys
+import tkinter.font
 import customtkinter as ctk
 
+FONTS_DIR = os.path.join("assets", "fonts")
+VARIABLE_FONTS = ["Inter-VariableFont_opsz,wght.ttf", "Inter-Italic-VariableFont_opsz,wght.ttf"]
+WEIGHTS = {"Thin", "ExtraLight", "Light", "Regular", "Medium", "SemiBold", "Bold", "ExtraBold", "Black"}
+BOLD_WEIGHTS = {"SemiBold", "Bold", "ExtraBold", "Black"}
+OPTICAL_SIZES = (18, 24, 28)
+
+
 class FontManager:
+    # One instance per process (see `font_manager` below), shared by every window
     def __init__(self):
+        self.base_path = getattr(sys, '_MEIPASS', os.path.abspath("."))
         self.fonts = {}
+        self.registered = {}
+        self.families = {}
+        self.font_hits = 0
+        self.font_misses = 0
 
-    def get(self, weight="Regular", size=14, italic=False):
-        # Just two values are valid: 'normal' or 'bold'
-        bold_weights = {"SemiBold", "Bold", "ExtraBold", "Black"}
-        actual_weight = "bold" if weight in bold_weights else "normal"
+    def register(self, relative_path):
+        if relative_path not in self.registered:
+            path = os.path.join(self.base_path, FONTS_DIR, relative_path)
+            installed = os.path.join(os.path.expanduser(ctk.FontManager.linux_font_path), os.path.basename(path))
+            try:
+                if sys.platform.startswith("linux") and os.path.exists(installed):
+                    # load_font() would copy it into ~/.fonts again on every start
+                    self.registered[relative_path] = True
+                else:
+                    self.registered[relative_path] = os.path.exists(path) and ctk.FontManager.load_font(path)
+            except Exception as e:
+                print(f"[FONTS] Error loading '{relative_path}': {e}")
+                self.registered[relative_path] = False
+        return self.registered[relative_path]
+
+    def register_fonts(self):
+        # Call before the first ctk.CTk(): on Linux the files are copied to ~/.fonts and Tk only
+        # picks up what is there when it starts. Variable fonts provide the plain "Inter" fallback.
+        for file_name in VARIABLE_FONTS:
+            self.register(file_name)
+        for opsz in OPTICAL_SIZES:
+            for weight in WEIGHTS:
+                self.register(os.path.join("static", f"Inter_{opsz}pt-{weight}.ttf"))
+
+    def has_family(self, family):
+        # Windows fonts are loaded private and not enumerable, so they never show up in families()
+        if sys.platform.startswith("win"):
+            return True
+        # fontconfig lists each static file only under its first family ("Inter 18pt" for the Medium file too),
+        # but still matches it by its full name, so ask Tk what it picked. A missing file falls back to
+        # another font (e.g. "DejaVu Sans") and fails the "Inter 18pt" prefix check.
+        if family not in self.families:
+            try:
+                actual = tkinter.font.Font(family=family).actual("family")
+            except Exception:
+                actual = ""
+            self.families[family] = actual.split()[:2] == family.split()[:2]
+        return self.families[family]
 
+    def resolve(self, weight, size, italic):
+        # Tk only knows 'normal' and 'bold', so each weight is loaded from its static file under its own family
+        if weight not in WEIGHTS:
+            weight = "Regular"
+        opsz = max((s for s in OPTICAL_SIZES if s <= size), default=OPTICAL_SIZES[0])
+        style = weight if not italic else ("Italic" if weight == "Regular" else f"{weight}Italic")
+        if weight in ("Regular", "Bold"):
+            family, actual_weight = f"Inter {opsz}pt", "bold" if weight == "Bold" else "normal"
+        else:
+            family, actual_weight = f"Inter {opsz}pt {weight}", "normal"
+        if self.register(os.path.join("static", f"Inter_{opsz}pt-{style}.ttf")) and self.has_family(family):
+            return family, actual_weight
+        return "Inter", "bold" if weight in BOLD_WEIGHTS else "normal"
+
+    def get(self, weight="Regular", size=14, italic=False):
         font_key = f"{weight}-{size}-{'italic' if italic else 'normal'}"
-        if font_key not in self.fonts:
-            self.fonts[font_key] = ctk.CTkFont(
-                family="Inter",
-                size=size,
-                weight=actual_weight,
-                slant="italic" if italic else "roman"
-            )
+        if font_key in self.fonts:
+            self.font_hits += 1
+            return self.fonts[font_key]
 
+        self.font_misses += 1
+        family, actual_weight = self.resolve(weight, size, italic)
+        self.fonts[font_key] = ctk.CTkFont(
+            family=family,
+            size=size,
+            weight=actual_weight,
+            slant="italic" if italic else "roman"
+        )
         return self.fonts[font_key]
+
+    def cache_stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "font_hits": self.font_hits,
+            "font_misses": self.font_misses,
+            "registered_files": sum(1 for ok in self.registered.values() if ok)
+        }
+
+
+font_manager = FontManager()
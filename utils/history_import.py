@@ -0,0 +1,149 @@
+import argparse
+import json
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from utils.stats import MusicStats
+
+BATCH_SIZE = 50000
+
+
+def parse_timestamp(value: str) -> datetime:
+    # Spotify uses "2024-05-01T10:00:00.123Z" (API / extended export) or "2024-05-01 10:00" (account export), always UTC
+    value = value.strip().replace("Z", "+00:00")
+    try:
+        stamp = datetime.fromisoformat(value)
+    except ValueError:
+        stamp = datetime.strptime(value, "%Y-%m-%d %H:%M")
+    if stamp.tzinfo is None:
+        stamp = stamp.replace(tzinfo=timezone.utc)
+    return stamp
+
+
+def play_from_recently_played(item: Dict[str, Any]) -> Dict[str, Any]:
+    track = item["track"]
+    return {
+        "id": track["id"],
+        "title": track["name"],
+        "artist": track["artists"][0]["name"],
+        "album": track["album"]["name"],
+        "duration": track["duration_ms"],
+        "played_at": parse_timestamp(item["played_at"]),
+        # The endpoint doesn't report how long the track played, assume it was played through
+        "ms_played": track["duration_ms"]
+    }
+
+
+def play_from_export(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    # Extended streaming history (Streaming_History_Audio_*.json)
+    if "ts" in entry:
+        title = entry.get("master_metadata_track_name")
+        artist = entry.get("master_metadata_album_artist_name")
+        if not title or not artist:
+            return None  # podcast episodes, audiobooks, local files without metadata
+        uri = entry.get("spotify_track_uri") or ""
+        return {
+            "id": uri.rsplit(":", 1)[-1] if uri else None,
+            "title": title,
+            "artist": artist,
+            "album": entry.get("master_metadata_album_album_name") or "Unknown",
+            "duration": 0,
+            "played_at": parse_timestamp(entry["ts"]),
+            "ms_played": entry.get("ms_played", 0)
+        }
+
+    # Account data streaming history (StreamingHistory*.json), it has no track ids, MusicStats.record_plays
+    # matches it to known tracks by artist and title
+    if "endTime" in entry:
+        title = entry.get("trackName")
+        artist = entry.get("artistName")
+        if not title or not artist:
+            return None
+        return {
+            "id": None,
+            "title": title,
+            "artist": artist,
+            "album": "Unknown",
+            "duration": 0,
+            "played_at": parse_timestamp(entry["endTime"]),
+            "ms_played": entry.get("msPlayed", 0)
+        }
+
+    return None
+
+
+def read_export(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    for entry in entries:
+        play = play_from_export(entry)
+        if play:
+            yield play
+
+
+def fetch_recently_played(sp, limit: int = 50) -> Iterator[Dict[str, Any]]:
+    results = sp.current_user_recently_played(limit=limit)
+    while results and results.get("items"):
+        for item in results["items"]:
+            if item.get("track") and item["track"].get("id"):
+                yield play_from_recently_played(item)
+        cursors = results.get("cursors") or {}
+        if not cursors.get("before"):
+            break
+        results = sp.current_user_recently_played(limit=limit, before=cursors["before"])
+
+
+def import_plays(stats: MusicStats, plays: Iterable[Dict[str, Any]], source: str,
+                 batch_size: int = BATCH_SIZE) -> int:
+    # Whatever was merged before an error is still saved and counted, the ledger keeps a re-run from doubling it
+    plays = iter(plays)
+    added = 0
+    seen = 0
+    try:
+        while True:
+            batch: List[Dict[str, Any]] = list(islice(plays, batch_size))
+            if not batch:
+                break
+            added += stats.record_plays(batch, save=False)
+            seen += len(batch)
+            print(f"[IMPORT] {source}: {seen} plays read, {added} new")
+    except Exception as e:
+        print(f"[IMPORT] Error importing {source} after {added} new plays: {e}")
+    if added:
+        stats.save_ledger()
+        stats.save_data()
+    return added
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill listening stats from Spotify history.")
+    parser.add_argument("files", nargs="*", help="Spotify streaming history JSON exports")
+    parser.add_argument("--recent", action="store_true", help="also import the recently played tracks from the Spotify API")
+    parser.add_argument("--data-file", default="data/music_stats.json")
+    args = parser.parse_args()
+
+    if not args.files and not args.recent:
+        parser.error("nothing to import, pass export files and/or --recent")
+
+    stats = MusicStats(args.data_file)
+    if not stats.locked:
+        # The app would overwrite the imported plays with its own copy of the stats on its next save
+        parser.exit(1, "[IMPORT] Close the app before importing, it is using the statistics file.\n")
+    added = 0
+    try:
+        for path in args.files:
+            added += import_plays(stats, read_export(path), f"'{path}'")
+        if args.recent:
+            from utils.spotify import sp
+            added += import_plays(stats, fetch_recently_played(sp), "recently played")
+    finally:
+        stats.close()
+    print(f"[IMPORT] Done, {added} new plays imported.")
+
+
+__all__ = ["import_plays", "read_export", "fetch_recently_played"]
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ import requests
 import urllib.parse
 import re
 
+LRCLIB_API_URL = "https://lrclib.net/api"
+
 def parse_lrc(lrc_text):
     pattern = re.compile(r"\[(\d+):(\d+)(?:\.(\d+))?\](.*)")
     parsed = []
@@ -31,7 +33,7 @@ def provider_lrclib(info):
     encoded_album_name = urllib.parse.quote(album_name)
 
     url = (
-        f"https://lrclib.net/api/get"
+        f"{LRCLIB_API_URL}/get"
         f"?track_name={encoded_track_name}"
         f"&artist_name={encoded_artist_name}"
         f"&album_name={encoded_album_name}"
@@ -42,7 +44,17 @@ def provider_lrclib(info):
         "User-Agent": "YeLyrics/1.0 (https://github.com/Bleyom/YeStreamArchive)"
     }
 
-    response = requests.get(url, headers=headers)
+    try:
+        response = requests.get(url, headers=headers, timeout=10)
+    except requests.RequestException as e:
+        print(f"[LRCLIB] Error al conectar: {e}")
+        return {
+            "provider": "lrclib",
+            "synced": False,
+            "lyrics": [],
+            "status": "not_found"
+        }
+
     if response.status_code == 200:
         data = response.json()
         if data.get("syncedLyrics"):
@@ -0,0 +1,701 @@
+import argparse
+import functools
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import types
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Any, Dict, List, Optional
+
+# Long-session soak test: replays a scripted listening session at accelerated speed against
+# LyricsDisplayApp and MusicStats, with local stand-ins for the Spotify Web API and LRCLIB.
+#
+#   python -m utils.soak --days 14 --report soak.json [--baseline previous_soak.json] [--no-ui]
+#
+# Needs a display (Tk window) unless --no-ui swaps the widgets for no-op stand-ins. Exits with 1 when
+# memory, tick latency or stats file I/O drift.
+
+SAMPLE_EVERY = timedelta(hours=1)
+
+
+class SimClock:
+    def __init__(self, start: datetime):
+        self.start = start
+        self.offset = 0.0
+        self.lock = threading.Lock()
+
+    def advance(self, seconds: float):
+        with self.lock:
+            self.offset += seconds
+
+    def time(self) -> float:
+        with self.lock:
+            return self.start.timestamp() + self.offset
+
+    def now(self, tz=None) -> datetime:
+        return datetime.fromtimestamp(self.time(), tz)
+
+
+class Faults:
+    # Active failure windows, per service: "error" answers 503, "slow" delays the answer
+    def __init__(self):
+        self.active: Dict[str, Dict[str, Any]] = {}
+
+    def start(self, service: str, kind: str, ticks: int, delay: float = 0.0):
+        self.active[service] = {"kind": kind, "ticks": ticks, "delay": delay}
+
+    def tick(self):
+        for service in list(self.active):
+            self.active[service]["ticks"] -= 1
+            if self.active[service]["ticks"] <= 0:
+                del self.active[service]
+
+    def get(self, service: str) -> Optional[Dict[str, Any]]:
+        return self.active.get(service)
+
+
+class FakePlayer:
+    def __init__(self, clock: SimClock, catalogue: List[Dict[str, Any]]):
+        self.clock = clock
+        self.catalogue = catalogue
+        self.index = 0
+        # Bumped whenever a different track starts, that is what the app can count as a new play
+        self.play_id = 0
+        self.track: Optional[Dict[str, Any]] = None
+        self.position_ms = 0.0
+        self.resumed_at: Optional[float] = None
+        self.lock = threading.Lock()
+
+    def progress_ms(self) -> float:
+        if self.resumed_at is None:
+            return self.position_ms
+        return self.position_ms + (self.clock.time() - self.resumed_at) * 1000
+
+    def play(self, index: int, position_ms: float = 0):
+        with self.lock:
+            self.index = index % len(self.catalogue)
+            if self.track is not self.catalogue[self.index]:
+                self.play_id += 1
+            self.track = self.catalogue[self.index]
+            self.position_ms = position_ms
+            self.resumed_at = self.clock.time()
+
+    def next(self):
+        self.play(self.index + 1)
+
+    def previous(self):
+        self.play(self.index - 1)
+
+    def seek(self, position_ms: float):
+        with self.lock:
+            self.position_ms = position_ms
+            self.resumed_at = self.clock.time() if self.resumed_at is not None else None
+
+    def pause(self):
+        with self.lock:
+            self.position_ms = self.progress_ms()
+            self.resumed_at = None
+
+    def resume(self):
+        with self.lock:
+            if self.track and self.resumed_at is None:
+                self.resumed_at = self.clock.time()
+
+    def stop(self):
+        with self.lock:
+            self.track = None
+            self.resumed_at = None
+
+    def playback(self) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            if not self.track:
+                return None
+            return {
+                "is_playing": self.resumed_at is not None,
+                "progress_ms": int(min(self.progress_ms(), self.track["duration_ms"])),
+                "item": self.track
+            }
+
+
+class Widget:
+    # No-op stand-in for every customtkinter widget and the root window in --no-ui runs, so the app's own
+    # update_loop, stats and lyrics code runs without a display
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name):
+        return self.ignore
+
+    def ignore(self, *args, **kwargs):
+        return None
+
+    def add(self, *args, **kwargs):
+        return Widget()
+
+    def winfo_children(self):
+        return []
+
+
+class HeadlessWidgets:
+    def __getattr__(self, name):
+        return Widget
+
+
+class HeadlessFonts:
+    # CTkFont needs a Tk root
+    def register_fonts(self):
+        pass
+
+    def get(self, *args, **kwargs):
+        return None
+
+    def cache_stats(self):
+        return {}
+
+
+def make_tracks(base_url: str, start: int, count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    # Eight tracks per artist, four per album
+    return [{
+        "id": f"soak{i:05d}",
+        "name": f"Track {i}",
+        "duration_ms": rng.randint(120, 360) * 1000,
+        "artists": [{"name": f"Artist {i // 8}"}],
+        "album": {"name": f"Album {i // 4}", "images": [{"url": f"{base_url}/images/{i // 4}.png"}]}
+    } for i in range(start, start + count)]
+
+
+def make_lrc(track: Dict[str, Any]) -> str:
+    lines = []
+    for second in range(0, track["duration_ms"] // 1000, 4):
+        lines.append(f"[{second // 60:02d}:{second % 60:02d}.00] {track['name']} line {second // 4}")
+    return "\n".join(lines)
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    service = ""
+    harness = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status: int, body: bytes = b"", content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def handle_request(self, method: str):
+        fault = self.harness.faults.get(self.service)
+        if fault and fault["kind"] == "slow":
+            time.sleep(fault["delay"])
+        elif fault and fault["kind"] == "error":
+            self.harness.counters[f"{self.service}_errors"] += 1
+            return self.reply(503, b'{"error": {"status": 503, "message": "soak fault"}}')
+        self.harness.counters[f"{self.service}_requests"] += 1
+        path = urllib.parse.urlparse(self.path)
+        query = urllib.parse.parse_qs(path.query)
+        status, body, content_type = self.harness.route(self.service, method, path.path, query)
+        self.reply(status, body, content_type)
+
+    def do_GET(self):
+        self.handle_request("GET")
+
+    def do_PUT(self):
+        self.handle_request("PUT")
+
+    def do_POST(self):
+        self.handle_request("POST")
+
+
+def start_server(harness, service: str) -> ThreadingHTTPServer:
+    handler = type(f"{service.title()}Handler", (FakeHandler,), {"service": service, "harness": harness})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def rss_bytes() -> Optional[int]:
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class Counters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+                (name, ctypes.c_size_t) for name in (
+                    "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                    "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage", "PagefileUsage", "PeakPagefileUsage")]
+
+        counters = Counters()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+    return None
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+class SoakHarness:
+    def __init__(self, days: float, tick_seconds: float, seed: int, catalogue_size: int, new_tracks_per_day: int,
+                 imported_plays: int, slow_delay: float, headless: bool = False):
+        self.days = days
+        self.headless = headless
+        self.tick_seconds = tick_seconds
+        self.slow_delay = slow_delay
+        self.rng = random.Random(seed)
+        self.clock = SimClock(datetime(2024, 1, 1, 8, 0))
+        self.faults = Faults()
+        self.counters = {name: 0 for name in (
+            "spotify_requests", "spotify_errors", "lrclib_requests", "lrclib_errors")}
+        self.events = {name: 0 for name in (
+            "track_change", "skip", "seek", "pause", "stop", "control", "stats_window", "fault", "outage")}
+        self.spotify_server = start_server(self, "spotify")
+        self.lrclib_server = start_server(self, "lrclib")
+        self.spotify_url = f"http://127.0.0.1:{self.spotify_server.server_address[1]}"
+        self.lrclib_url = f"http://127.0.0.1:{self.lrclib_server.server_address[1]}"
+        self.catalogue = make_tracks(self.spotify_url, 0, catalogue_size, self.rng)
+        self.by_name = {track["name"]: track for track in self.catalogue}
+        self.new_tracks_per_day = new_tracks_per_day
+        self.imported_plays = imported_plays
+        self.player = FakePlayer(self.clock, self.catalogue)
+        self.cover = self.make_cover()
+        self.io = {"saves": 0, "bytes": 0, "ledger_saves": 0}
+        self.plays_seen = 0
+        self.playback_ms = 0.0
+        self.seen_play_id = 0
+        self.samples: List[Dict[str, Any]] = []
+        self.tick_latencies: List[float] = []
+        self.tmp = tempfile.TemporaryDirectory(prefix="lyrics-soak-")
+
+    def grow_catalogue(self):
+        # New releases every day keep MusicStats.data growing like it does for a real listener
+        for track in make_tracks(self.spotify_url, len(self.catalogue), self.new_tracks_per_day, self.rng):
+            self.catalogue.append(track)
+            self.by_name[track["name"]] = track
+
+    def seed_history(self, stats_class, data_file: str):
+        # A year of imported plays from before the run, as left behind by utils.history_import
+        start = self.clock.time() - 365 * 86400
+        step = 365 * 86400 / max(self.imported_plays, 1)
+        plays = []
+        for n in range(self.imported_plays):
+            track = self.catalogue[self.rng.randrange(len(self.catalogue))]
+            plays.append({
+                "id": track["id"],
+                "title": track["name"],
+                "artist": track["artists"][0]["name"],
+                "album": track["album"]["name"],
+                "duration": track["duration_ms"],
+                "played_at": datetime.fromtimestamp(start + n * step, timezone.utc),
+                "ms_played": track["duration_ms"]
+            })
+        stats = stats_class(data_file)
+        try:
+            return stats.record_plays(plays)
+        finally:
+            stats.close()
+
+    def make_cover(self) -> bytes:
+        from PIL import Image
+        buffer = BytesIO()
+        Image.new("RGB", (300, 300), (29, 185, 84)).save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    def route(self, service: str, method: str, path: str, query: Dict[str, List[str]]):
+        if service == "lrclib":
+            track = self.by_name.get(query.get("track_name", [""])[0])
+            # Every fifth track has no lyrics, every seventh only plain lyrics
+            if not track or int(track["id"][4:]) % 5 == 0:
+                return 404, b'{"statusCode": 404, "name": "TrackNotFound"}', "application/json"
+            if int(track["id"][4:]) % 7 == 0:
+                return 200, json.dumps({"plainLyrics": "la la la"}).encode(), "application/json"
+            return 200, json.dumps({"syncedLyrics": make_lrc(track)}).encode(), "application/json"
+
+        if path.startswith("/images/"):
+            return 200, self.cover, "image/png"
+        if path == "/v1/me/player" and method == "GET":
+            playback = self.player.playback()
+            return (200, json.dumps(playback).encode(), "application/json") if playback else (204, b"", "application/json")
+        actions = {
+            "/v1/me/player/next": self.player.next,
+            "/v1/me/player/previous": self.player.previous,
+            "/v1/me/player/pause": self.player.pause,
+            "/v1/me/player/play": self.player.resume
+        }
+        if path in actions:
+            actions[path]()
+            return 204, b"", "application/json"
+        return 404, b'{"error": {"status": 404, "message": "not found"}}', "application/json"
+
+    def install(self):
+        # Point the app at the stand-ins and at simulated time before anything is imported from main
+        os.environ.setdefault("SPOTIPY_CLIENT_ID", "soak")
+        os.environ.setdefault("SPOTIPY_CLIENT_SECRET", "soak")
+        os.environ.setdefault("SPOTIPY_REDIRECT_URI", "http://127.0.0.1:8888/callback")
+
+        import spotipy
+        import utils.providers
+        import utils.spotify
+        import utils.stats
+
+        client = spotipy.Spotify(auth="soak", requests_timeout=5, retries=0, status_retries=0)
+        client.prefix = f"{self.spotify_url}/v1/"
+        utils.spotify.sp = client
+        utils.providers.LRCLIB_API_URL = f"{self.lrclib_url}/api"
+
+        clock = self.clock
+
+        class SimDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now(tz)
+
+        utils.stats.datetime = SimDatetime
+
+        import main
+        main.sp = client
+        main.time = types.SimpleNamespace(time=clock.time)
+        if self.headless:
+            main.ctk = utils.stats.ctk = HeadlessWidgets()
+            main.font_manager = utils.stats.font_manager = HeadlessFonts()
+        data_file = os.path.join(self.tmp.name, "music_stats.json")
+        self.seeded_plays = self.seed_history(utils.stats.MusicStats, data_file)
+        main.MusicStats = functools.partial(utils.stats.MusicStats, data_file)
+        return main
+
+    def instrument_stats(self, stats):
+        save_data = stats.save_data
+
+        def counted_save():
+            save_data()
+            self.io["saves"] += 1
+            if os.path.exists(stats.data_file):
+                self.io["bytes"] += os.path.getsize(stats.data_file)
+
+        stats.save_data = counted_save
+        save_ledger = stats.save_ledger
+
+        def counted_ledger_save():
+            save_ledger()
+            self.io["ledger_saves"] += 1
+
+        stats.save_ledger = counted_ledger_save
+
+    def total_plays(self, stats) -> int:
+        return sum(track["plays"] for track in stats.data["tracks"].values())
+
+    def script_step(self, app):
+        # Scripted listening behaviour: mostly letting tracks run, with skips, seeks, pauses and nights off
+        rng = self.rng
+        now = self.clock.now()
+        awake = 8 <= now.hour < 24
+        playback = self.player.playback()
+
+        if not awake:
+            if playback:
+                self.player.stop()
+                self.events["stop"] += 1
+            return
+        if not playback:
+            self.player.play(rng.randrange(len(self.catalogue)))
+            self.events["track_change"] += 1
+            return
+        if playback["is_playing"] and playback["progress_ms"] >= playback["item"]["duration_ms"]:
+            self.player.next()
+            self.events["track_change"] += 1
+            return
+
+        roll = rng.random()
+        if roll < 0.02:
+            self.player.play(rng.randrange(len(self.catalogue)))
+            self.events["skip"] += 1
+        elif roll < 0.03:
+            self.player.seek(rng.randrange(playback["item"]["duration_ms"]))
+            self.events["seek"] += 1
+        elif roll < 0.035:
+            if playback["is_playing"]:
+                self.player.pause()
+            else:
+                self.player.resume()
+            self.events["pause"] += 1
+        elif roll < 0.037:
+            # Go through the app's own controls, which hit the fake API
+            rng.choice([app.next_track, app.prev_track, app.toggle_play_pause])()
+            self.events["control"] += 1
+
+        if rng.random() < 0.002 and not self.faults.active:
+            service = rng.choice(["spotify", "lrclib"])
+            self.faults.start(service, rng.choice(["error", "slow"]), rng.randint(1, 10), self.slow_delay)
+            self.events["fault"] += 1
+        elif rng.random() < 0.0005 and not self.faults.active:
+            # Offline for hours while the player goes on, none of it may be credited to the track the app last saw
+            self.faults.start("spotify", "error", int(rng.uniform(1, 4) * 3600 / self.tick_seconds))
+            self.events["outage"] += 1
+
+    def open_stats_window(self, app):
+        import utils.stats
+        window = utils.stats.StatsWindow(app.root, app.stats)
+        app.root.update()
+        window.window.destroy()
+        self.events["stats_window"] += 1
+
+    def sample(self, app, window: List[float]):
+        gc.collect()
+        self.samples.append({
+            "sim_time": self.clock.now().isoformat(),
+            "rss": rss_bytes(),
+            "objects": len(gc.get_objects()),
+            "tracks": len(app.stats.data["tracks"]),
+            "stats_file_bytes": os.path.getsize(app.stats.data_file) if os.path.exists(app.stats.data_file) else 0,
+            "ledger_file_bytes": os.path.getsize(app.stats.ledger_file) if os.path.exists(app.stats.ledger_file) else 0,
+            # The live app must never load the import ledger, None means it didn't
+            "imported_plays": sum(map(len, app.stats.ledger.values())) if app.stats.ledger is not None else None,
+            "ledger_saves": self.io["ledger_saves"],
+            "stats_saves": self.io["saves"],
+            "stats_bytes": self.io["bytes"],
+            # Hours with something playing, idle night hours have much cheaper ticks
+            "active": not self.samples or self.io["saves"] > self.samples[-1]["stats_saves"],
+            "tick_p50_ms": percentile(window, 0.5),
+            "tick_p95_ms": percentile(window, 0.95),
+            "font_cache": app.fonts.cache_stats()
+        })
+
+    def run(self):
+        main = self.install()
+        if self.headless:
+            # Widget.after() schedules nothing, the harness drives update_loop itself
+            root = Widget()
+        else:
+            import customtkinter as ctk
+
+            main.font_manager.register_fonts()
+            root = ctk.CTk()
+            after = root.after
+
+            def after_without_update_loop(ms, func=None, *args):
+                # The harness drives update_loop itself, one tick per step of simulated time
+                if getattr(func, "__name__", "") == "update_loop":
+                    return None
+                return after(ms, func, *args)
+
+            root.after = after_without_update_loop
+        app = main.LyricsDisplayApp(root)
+        self.instrument_stats(app.stats)
+        plays_before = self.total_plays(app.stats)
+        listening_before = app.stats.data["total_listening_time"]
+
+        ticks = int(self.days * 86400 / self.tick_seconds)
+        next_sample = self.clock.now() + SAMPLE_EVERY
+        last_day = self.clock.now().date()
+        window: List[float] = []
+        started = time.perf_counter()
+
+        for _ in range(ticks):
+            self.script_step(app)
+            faulty = bool(self.faults.active)
+            playback = self.player.playback()
+            if playback and playback["is_playing"]:
+                left = playback["item"]["duration_ms"] - playback["progress_ms"]
+                self.playback_ms += min(self.tick_seconds * 1000, max(left, 0))
+            self.clock.advance(self.tick_seconds)
+
+            tick_start = time.perf_counter()
+            app.update_loop()
+            root.update()
+            latency = (time.perf_counter() - tick_start) * 1000
+            # A track start the app polled successfully at least once is a play it should have counted
+            spotify_fault = self.faults.get("spotify")
+            if self.player.track and not (spotify_fault and spotify_fault["kind"] == "error"):
+                if self.player.play_id != self.seen_play_id:
+                    self.seen_play_id = self.player.play_id
+                    self.plays_seen += 1
+            self.faults.tick()
+            # Ticks inside a fault window are slow on purpose, keep them out of the latency stats
+            if not faulty:
+                window.append(latency)
+                self.tick_latencies.append(latency)
+
+            if self.clock.now().date() != last_day:
+                last_day = self.clock.now().date()
+                self.grow_catalogue()
+                self.open_stats_window(app)
+            if self.clock.now() >= next_sample:
+                next_sample += SAMPLE_EVERY
+                self.sample(app, window)
+                window = []
+
+        root.destroy()
+        self.spotify_server.shutdown()
+        self.lrclib_server.shutdown()
+        return {
+            "days": self.days,
+            "headless": self.headless,
+            "ticks": ticks,
+            "tick_seconds": self.tick_seconds,
+            "wall_seconds": round(time.perf_counter() - started, 1),
+            "tick_p50_ms": percentile(self.tick_latencies, 0.5),
+            "tick_p95_ms": percentile(self.tick_latencies, 0.95),
+            "stats_saves": self.io["saves"],
+            "stats_bytes": self.io["bytes"],
+            "imported_plays": self.seeded_plays,
+            "plays_expected": self.plays_seen,
+            "plays_recorded": self.total_plays(app.stats) - plays_before,
+            "playback_ms": int(self.playback_ms),
+            "listening_ms_recorded": app.stats.data["total_listening_time"] - listening_before,
+            "requests": self.counters,
+            "events": self.events,
+            "samples": self.samples
+        }
+
+
+def window_median(samples: List[Dict[str, Any]], key: str, start: float, end: float) -> Optional[float]:
+    first = int(len(samples) * start)
+    chunk = samples[first:max(int(len(samples) * end), first + 1)]
+    values = [s[key] for s in chunk if s.get(key) is not None]
+    return statistics.median(values) if values else None
+
+
+def check(report: Dict[str, Any], baseline: Optional[Dict[str, Any]], max_rss_growth_mb: float,
+          max_object_growth: float, max_latency_growth: float, max_io_growth: float,
+          max_bytes_per_track: float, max_listening_ratio: float) -> List[str]:
+    # Compare the end of the run with the period right after warm-up (first 10% of samples is skipped)
+    samples = report["samples"]
+    failures = []
+    if len(samples) < 10:
+        return [f"only {len(samples)} samples, run more simulated time"]
+
+    early_rss = window_median(samples, "rss", 0.1, 0.2)
+    late_rss = window_median(samples, "rss", 0.9, 1.0)
+    if early_rss and late_rss and (late_rss - early_rss) / 2 ** 20 > max_rss_growth_mb:
+        failures.append(f"RSS grew {(late_rss - early_rss) / 2 ** 20:.1f} MB after warm-up")
+
+    early_objects = window_median(samples, "objects", 0.1, 0.2)
+    late_objects = window_median(samples, "objects", 0.9, 1.0)
+    if early_objects and late_objects / early_objects > max_object_growth:
+        failures.append(f"Python objects grew from {early_objects:.0f} to {late_objects:.0f}")
+
+    # The slowest active ticks are the ones saving the stats file, which grows with the catalogue,
+    # so the allowed p95 grows with the number of tracks too
+    active = [s for s in samples if s["active"]]
+    early_p95 = window_median(active, "tick_p95_ms", 0.1, 0.2)
+    late_p95 = window_median(active, "tick_p95_ms", 0.9, 1.0)
+    track_growth = (window_median(active, "tracks", 0.9, 1.0) or 1) / (window_median(active, "tracks", 0.1, 0.2) or 1)
+    if early_p95 and late_p95 and late_p95 > max(early_p95 * track_growth * max_latency_growth, 5.0):
+        failures.append(f"tick p95 drifted from {early_p95:.1f} ms to {late_p95:.1f} ms "
+                        f"while the catalogue grew {track_growth:.2f}x")
+
+    # The catalogue grows every day, so the stats file may grow with it but not faster
+    def bytes_per_save_per_track(start, end):
+        chunk = samples[int(len(samples) * start):int(len(samples) * end)]
+        saves = chunk[-1]["stats_saves"] - chunk[0]["stats_saves"] if len(chunk) > 1 else 0
+        if not saves:
+            return None
+        return (chunk[-1]["stats_bytes"] - chunk[0]["stats_bytes"]) / saves / max(chunk[-1]["tracks"], 1)
+
+    early_io = bytes_per_save_per_track(0.1, 0.2)
+    late_io = bytes_per_save_per_track(0.9, 1.0)
+    if early_io and late_io and late_io / early_io > max_io_growth:
+        failures.append(f"stats file writes grew from {early_io:.0f} to {late_io:.0f} bytes per save and track")
+
+    last = samples[-1]
+    if last["stats_file_bytes"] / max(last["tracks"], 1) > max_bytes_per_track:
+        failures.append(f"stats file is {last['stats_file_bytes'] / max(last['tracks'], 1):.0f} bytes per track")
+    if last["imported_plays"] is not None or last["ledger_saves"]:
+        failures.append("the live app loaded or wrote the import ledger")
+
+    if report["plays_recorded"] != report["plays_expected"]:
+        failures.append(f"recorded {report['plays_recorded']} live plays, "
+                        f"the fake player started {report['plays_expected']} the app could see")
+    # Ticks with the API down still count as playback here, the app may credit less but never more
+    if report["listening_ms_recorded"] > report["playback_ms"] * max_listening_ratio:
+        failures.append(f"credited {report['listening_ms_recorded'] / 3600000:.1f} h of listening time, "
+                        f"the fake player played {report['playback_ms'] / 3600000:.1f} h")
+
+    if baseline:
+        # Ticks without widgets are much cheaper, only compare latency between runs of the same kind
+        same_mode = baseline.get("headless", False) == report["headless"]
+        if same_mode and report["tick_p95_ms"] > max(baseline["tick_p95_ms"] * max_latency_growth, 5.0):
+            failures.append(f"tick p95 {report['tick_p95_ms']:.1f} ms vs baseline {baseline['tick_p95_ms']:.1f} ms")
+        base_days = baseline["days"] or 1
+        if report["stats_bytes"] / (report["days"] or 1) > baseline["stats_bytes"] / base_days * max_io_growth:
+            failures.append("stats file I/O per simulated day regressed against baseline")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Accelerated long-session soak test for LyricsDisplay.")
+    parser.add_argument("--days", type=float, default=14, help="simulated days to run")
+    parser.add_argument("--tick-seconds", type=float, default=30, help="simulated seconds between app ticks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--catalogue", type=int, default=400, help="number of distinct fake tracks at the start")
+    parser.add_argument("--new-tracks-per-day", type=int, default=40, help="fake tracks added every simulated day")
+    parser.add_argument("--imported-plays", type=int, default=100000, help="imported history to seed the stats with")
+    parser.add_argument("--slow-delay", type=float, default=0.5, help="real seconds a slow response takes")
+    parser.add_argument("--no-ui", action="store_true", help="run without a display, widgets are no-op stand-ins")
+    parser.add_argument("--report", help="write the JSON report here")
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50)
+    parser.add_argument("--max-object-growth", type=float, default=1.5)
+    parser.add_argument("--max-latency-growth", type=float, default=2.0)
+    parser.add_argument("--max-io-growth", type=float, default=1.5)
+    parser.add_argument("--max-bytes-per-track", type=float, default=2048)
+    parser.add_argument("--max-listening-ratio", type=float, default=1.05,
+                        help="credited listening time allowed per simulated playback time")
+    args = parser.parse_args()
+
+    harness = SoakHarness(args.days, args.tick_seconds, args.seed, args.catalogue, args.new_tracks_per_day,
+                          args.imported_plays, args.slow_delay, args.no_ui)
+    report = harness.run()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    failures = check(report, baseline, args.max_rss_growth_mb, args.max_object_growth,
+                     args.max_latency_growth, args.max_io_growth, args.max_bytes_per_track,
+                     args.max_listening_ratio)
+    report["failures"] = failures
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"[SOAK] {report['days']} days, {report['ticks']} ticks in {report['wall_seconds']}s, "
+          f"tick p50 {report['tick_p50_ms']:.1f} ms / p95 {report['tick_p95_ms']:.1f} ms, "
+          f"{report['stats_saves']} saves / {report['stats_bytes'] / 2 ** 20:.1f} MB written, "
+          f"{report['plays_recorded']}/{report['plays_expected']} plays recorded, "
+          f"{report['listening_ms_recorded'] / 3600000:.1f}/{report['playback_ms'] / 3600000:.1f} h listening credited")
+    for failure in failures:
+        print(f"[SOAK] FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
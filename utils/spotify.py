@@ -1,4 +1,6 @@
+import requests
 import spotipy
+from spotipy.exceptions import SpotifyException
 from spotipy.oauth2 import SpotifyOAuth
 import os
 from dotenv import load_dotenv
@@ -9,7 +11,7 @@ sp = spotipy.Spotify(auth_manager=SpotifyOAuth(
     client_id=os.getenv("SPOTIPY_CLIENT_ID"),
     client_secret=os.getenv("SPOTIPY_CLIENT_SECRET"),
     redirect_uri=os.getenv("SPOTIPY_REDIRECT_URI"),
-    scope="user-read-playback-state user-modify-playback-state user-read-currently-playing"
+    scope="user-read-playback-state user-modify-playback-state user-read-currently-playing user-read-recently-played"
 ))
 
 def get_current_playing_track():
@@ -28,6 +30,10 @@ def get_current_playing_track():
             }
         else:
             print("[Spotify] Nada está sonando.")
+    except (SpotifyException, requests.RequestException) as e:
+        # A failed request says nothing about what is playing, let the caller keep its state
+        print(f"[Spotify] Error al obtener canción: {e}")
+        raise
     except Exception as e:
         print(f"[Spotify] Error al obtener canción: {e}")
     return None
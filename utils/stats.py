@@ -1,25 +1,45 @@
 import json
 import os
-from datetime import datetime
+import uuid
+from datetime import datetime, timedelta, timezone
+from bisect import bisect_left, bisect_right, insort
 from collections import defaultdict
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Iterable
 import customtkinter as ctk
-from utils.font_manager import FontManager
+from utils.font_manager import font_manager
 from utils.i18n import Translator
 from dotenv import load_dotenv
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 load_dotenv()
 lang_code = os.getenv("APP_LANG", "en")
 t = Translator(lang_code).t
 
+# Imported plays this close in time to an already known play of the same track are the same play
+# (account data exports only have minute precision)
+MATCH_SLACK_S = 60
+
 
 class MusicStats:
     def __init__(self, data_file: str = "data/music_stats.json"):
         self.data_file = data_file
         os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        # Only the history importer reads and writes this one, it stays out of the live save path
+        self.ledger_file = os.path.join(os.path.dirname(data_file), "imported_plays.json")
+        self.ledger = None
+        self.lock_handle = None
+        self.locked = self.acquire_lock()
+        if not self.locked:
+            print(f"[STATS] '{data_file}' is in use by another process, its changes may be overwritten")
         self.data = self.load_data()
         self.current_track = None
         self.track_start_time = None
+        self.live_window = None
 
     def load_data(self) -> Dict[str, Any]:
         if os.path.exists(self.data_file):
@@ -28,11 +48,14 @@ class MusicStats:
                     data = json.load(f)
                     if "hours" in data:
                         hours = defaultdict(int)
-                        hours.update(data["hours"])
+                        hours.update({int(hour): count for hour, count in data["hours"].items()})
                         data["hours"] = hours
                     for artist_data in data.get("artists", {}).values():
                         if isinstance(artist_data.get("unique_tracks"), list):
                             artist_data["unique_tracks"] = set(artist_data["unique_tracks"])
+                    data.pop("imported_plays", None)
+                    if "live_windows" not in data:
+                        data["live_windows"] = self.legacy_windows(data)
                     return data
             except Exception as e:
                 print(f"[STATS] Error loading statistics: {e}")
@@ -45,9 +68,30 @@ class MusicStats:
             "hours": defaultdict(int),
             "total_listening_time": 0,
             "first_track": None,
+            "live_windows": [],
             "last_updated": datetime.now().isoformat()
         }
 
+    def legacy_windows(self, data: Dict[str, Any]) -> List[List[int]]:
+        # Stats from before live windows were recorded don't say when the app was open, so every day
+        # it recorded something counts as live and the history importer skips that whole day
+        days = set(data.get("daily_activity", {}))
+        for track in data.get("tracks", {}).values():
+            days.update(track[key][:10] for key in ("first_played", "last_played") if track.get(key))
+        if data.get("first_track"):
+            days.add(data["first_track"]["date"][:10])
+
+        windows = []
+        for day in sorted(days):
+            try:
+                start = datetime.fromisoformat(day)
+            except ValueError:
+                continue
+            windows.append([int(start.timestamp()), int((start + timedelta(days=1)).timestamp()) - 1])
+        if windows:
+            print(f"[STATS] No live sessions recorded yet, history imports will skip the {len(windows)} days with stats")
+        return windows
+
     def save_data(self):
         try:
             data_to_save = dict(self.data)
@@ -61,9 +105,105 @@ class MusicStats:
         except Exception as e:
             print(f"[STATS] Error saving statistics: {e}")
 
+    def acquire_lock(self) -> bool:
+        # Held until close(), so the app and the history importer never write the same stats file at once
+        try:
+            self.lock_handle = open(self.data_file + ".lock", 'a+')
+            self.lock_handle.seek(0)
+            if fcntl:
+                fcntl.flock(self.lock_handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                msvcrt.locking(self.lock_handle.fileno(), msvcrt.LK_NBLCK, 1)
+            return True
+        except OSError:
+            if self.lock_handle:
+                self.lock_handle.close()
+            self.lock_handle = None
+            return False
+
+    def close(self):
+        if self.lock_handle is None:
+            return
+        try:
+            if fcntl:
+                fcntl.flock(self.lock_handle, fcntl.LOCK_UN)
+            else:
+                self.lock_handle.seek(0)
+                msvcrt.locking(self.lock_handle.fileno(), msvcrt.LK_UNLCK, 1)
+        except OSError:
+            pass
+        self.lock_handle.close()
+        self.lock_handle = None
+        self.locked = False
+
+    def load_ledger(self) -> Dict[str, List[int]]:
+        # The ledger only describes the stats file saved with the same generation. If the stats file was
+        # deleted, restored or overwritten since, the imports it lists may be gone and it is ignored.
+        if self.ledger is None:
+            self.ledger = {}
+            if os.path.exists(self.ledger_file):
+                try:
+                    with open(self.ledger_file, 'r', encoding='utf-8') as f:
+                        ledger = json.load(f)
+                    generation = self.data.get("import_generation")
+                    if generation and ledger.get("generation") == generation:
+                        self.ledger = ledger["plays"]
+                    else:
+                        print("[STATS] Imported plays don't match the statistics file, ignoring them")
+                except Exception as e:
+                    print(f"[STATS] Error loading imported plays: {e}")
+        return self.ledger
+
+    def save_ledger(self):
+        # Starts a new generation, save_data() has to follow so the stats file carries the same one
+        if self.ledger is None:
+            return
+        generation = uuid.uuid4().hex
+        try:
+            with open(self.ledger_file, 'w', encoding='utf-8') as f:
+                json.dump({"generation": generation, "plays": self.ledger}, f, ensure_ascii=False,
+                          separators=(",", ":"))
+            self.data["import_generation"] = generation
+        except Exception as e:
+            print(f"[STATS] Error saving imported plays: {e}")
+
+    def mark_live(self, track_info: Dict[str, Any]):
+        # One [start, end] window (epoch seconds) per app run: plays inside it were counted live,
+        # so the history importer skips them
+        now = int(datetime.now().timestamp())
+        end = now + int(track_info.get("duration", 0)) // 1000 if track_info else now
+        if self.live_window is None:
+            self.live_window = [now, end]
+            self.data["live_windows"].append(self.live_window)
+        else:
+            self.live_window[1] = max(self.live_window[1], end)
+
+    def merge_track(self, old_id: str, new_id: str):
+        # Account data exports have no track ids, fold those entries into the real track once it is known
+        old = self.data["tracks"].pop(old_id)
+        new = self.data["tracks"].get(new_id)
+        if new is None:
+            self.data["tracks"][new_id] = old
+        else:
+            new["plays"] += old["plays"]
+            new["total_listening_time"] += old["total_listening_time"]
+            new["first_played"] = min(new["first_played"], old["first_played"])
+            new["last_played"] = max(new["last_played"], old["last_played"])
+        artist_data = self.data["artists"].get(old["artist"])
+        if artist_data:
+            unique_tracks = set(artist_data["unique_tracks"])
+            unique_tracks.discard(old_id)
+            unique_tracks.add(new_id)
+            artist_data["unique_tracks"] = unique_tracks
+
     def new_track(self, track_info: Dict[str, Any]):
+        self.mark_live(track_info)
         if self.current_track and self.track_start_time:
             listening_time = (datetime.now() - self.track_start_time).total_seconds() * 1000
+            # Polls can fail for hours while the track stays current, never credit more than was left of it
+            remaining = self.current_track.get("duration", 0) - self.current_track.get("progress_ms", 0)
+            if remaining > 0:
+                listening_time = min(listening_time, remaining)
             self.record_listening_time(self.current_track, int(listening_time))
 
         self.current_track = track_info
@@ -85,6 +225,9 @@ class MusicStats:
         album = track_info.get("album", "Unknown")
         duration = track_info.get("duration", 0)
 
+        if f"{artist} - {title}" in self.data["tracks"] and track_id:
+            self.merge_track(f"{artist} - {title}", track_id)
+
         if not self.data["first_track"]:
             self.data["first_track"] = {
                 "title": title,
@@ -161,6 +304,111 @@ class MusicStats:
         print(f"[STATS] Recorded {time_ms/1000:.1f}s of {track_info.get('title', 'Unknown')}")
         self.save_data()
 
+    def record_plays(self, plays: Iterable[Dict[str, Any]], save: bool = True) -> int:
+        # Bulk import, writes the stats file once. A play is skipped when it falls inside a live window
+        # or the ledger already has the same artist and title within MATCH_SLACK_S of it.
+        tracks = self.data["tracks"]
+        artists = self.data["artists"]
+        albums = self.data["albums"]
+        daily = self.data["daily_activity"]
+        hours = self.data["hours"]
+        ledger = self.load_ledger()
+        windows = []
+        for start, end in sorted(self.data.get("live_windows", [])):
+            if windows and start <= windows[-1][1]:
+                windows[-1][1] = max(windows[-1][1], end)
+            else:
+                windows.append([start, end])
+        window_starts = [start for start, _ in windows]
+        track_ids = {f"{data['artist']}\t{data['title']}".lower(): track_id
+                     for track_id, data in tracks.items() if track_id != f"{data['artist']} - {data['title']}"}
+        added = 0
+
+        for play in plays:
+            played_at = play["played_at"].astimezone(timezone.utc)
+            epoch = int(played_at.timestamp())
+            title = play.get("title", "Unknown")
+            artist = play.get("artist", "Unknown")
+
+            w = bisect_right(window_starts, epoch + MATCH_SLACK_S) - 1
+            if w >= 0 and epoch <= windows[w][1] + MATCH_SLACK_S:
+                continue
+
+            key = f"{artist}\t{title}".lower()
+            times = ledger.setdefault(key, [])
+            i = bisect_left(times, epoch - MATCH_SLACK_S)
+            if i < len(times) and times[i] <= epoch + MATCH_SLACK_S:
+                continue
+            insort(times, epoch)
+            added += 1
+
+            pseudo_id = f"{artist} - {title}"
+            track_id = play.get("id") or track_ids.get(key) or pseudo_id
+            if track_id != pseudo_id:
+                track_ids.setdefault(key, track_id)
+                if pseudo_id in tracks:
+                    self.merge_track(pseudo_id, track_id)
+
+            track = tracks.get(track_id)
+            album = play.get("album", "Unknown")
+            if album == "Unknown" and track:
+                album = track["album"]
+            time_ms = max(int(play.get("ms_played", 0)), 0)
+            local_time = played_at.astimezone().replace(tzinfo=None)
+            stamp = local_time.isoformat()
+
+            first = self.data["first_track"]
+            if not first or stamp < first["date"]:
+                self.data["first_track"] = {"title": title, "artist": artist, "date": stamp}
+
+            if track is None:
+                track = tracks[track_id] = {
+                    "title": title,
+                    "artist": artist,
+                    "album": album,
+                    "duration": play.get("duration", 0),
+                    "plays": 0,
+                    "total_listening_time": 0,
+                    "first_played": stamp,
+                    "last_played": stamp
+                }
+            elif track["album"] == "Unknown" and album != "Unknown":
+                track["album"] = album
+            track["plays"] += 1
+            track["total_listening_time"] += time_ms
+            if stamp < track["first_played"]:
+                track["first_played"] = stamp
+            if stamp > track["last_played"]:
+                track["last_played"] = stamp
+
+            artist_data = artists.get(artist)
+            if artist_data is None:
+                artist_data = artists[artist] = {"plays": 0, "total_time": 0, "unique_tracks": set()}
+            if isinstance(artist_data["unique_tracks"], list):
+                artist_data["unique_tracks"] = set(artist_data["unique_tracks"])
+            artist_data["plays"] += 1
+            artist_data["total_time"] += time_ms
+            artist_data["unique_tracks"].add(track_id)
+
+            # Account data exports don't name the album, leave it out until a play of the track does
+            if album != "Unknown":
+                album_data = albums.get(album)
+                if album_data is None:
+                    album_data = albums[album] = {"artist": artist, "plays": 0, "total_time": 0}
+                album_data["plays"] += 1
+                album_data["total_time"] += time_ms
+
+            hours[local_time.hour] += 1
+            if time_ms:
+                day = local_time.date().isoformat()
+                daily[day] = daily.get(day, 0) + time_ms
+                self.data["total_listening_time"] += time_ms
+
+        if added and save:
+            self.save_ledger()
+            self.save_data()
+        return added
+
     def get_top_tracks(self, limit: int = 10) -> List[Dict[str, Any]]:
         sorted_tracks = sorted(
             self.data["tracks"].items(),
@@ -242,7 +490,7 @@ class StatsWindow:
         self.window.geometry("900x700")
         self.window.configure(fg_color="#191414")
 
-        self.fonts = FontManager()
+        self.fonts = font_manager
         self.create_interface()
         self.update_data()
 